@@ -1,15 +1,24 @@
 from enum import StrEnum, IntEnum
 import datetime
-from typing import Generic, Optional, TypeVar, TypedDict, NotRequired
+from typing import Annotated, Generic, Optional, TypeVar, TypedDict, NotRequired
 
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, BeforeValidator, ConfigDict, PrivateAttr, computed_field
+from pydantic.dataclasses import dataclass
 
 dataR = TypeVar("dataR", bound=TypedDict)
-dataP = TypeVar("dataP", bound=BaseModel)
+# Unbound so that a bare (unparametrized) SuccessResponse validates its data as Any
+dataP = TypeVar("dataP")
 
 def make_tz_aware(v):
-    tz_aware =  datetime.datetime.fromisoformat(v + "+00:00")
-    return tz_aware
+    if not isinstance(v, str):
+        return v
+    if v.endswith("Z"):
+        return datetime.datetime.fromisoformat(v)
+    # Parsing the UTC suffix lets fromisoformat attach timezone.utc itself,
+    # which is cheaper than a separate datetime.replace(tzinfo=...) call
+    return datetime.datetime.fromisoformat(v + "+00:00")
+
+TzAwareDateTime = Annotated[datetime.datetime, BeforeValidator(make_tz_aware)]
 
 class ResponseStatus(StrEnum):
     OK = "OK"
@@ -75,21 +84,23 @@ class MetaRaw(TypedDict):
     version: str
     
 class Meta(BaseModel):
-    last_active: datetime.datetime
+    model_config = ConfigDict(frozen=True)
+
+    last_active: TzAwareDateTime
     tid: str
-    time: datetime.datetime
+    time: TzAwareDateTime
     token_limit: int
     token_remaining: int
-    token_reset: datetime.datetime
+    token_reset: TzAwareDateTime
     version: str
-    
-    _make_tz_aware = validator("last_active", "time", "token_reset", pre=True, allow_reuse=True)(make_tz_aware)
 
 class BaseResponseRaw(TypedDict):
     status: ResponseStatus
     meta: MetaRaw
 
 class BaseResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     status: ResponseStatus
     meta: Meta
 
@@ -104,6 +115,8 @@ class ErrorDataRaw(TypedDict):
     message: str
 
 class ErrorData(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     code: ErrorCode
     message: str
 
@@ -119,7 +132,8 @@ class ZoneRaw(TypedDict):
     name: str
     smart: ZoneSmart
 
-class Zone(BaseModel):
+@dataclass(slots=True, frozen=True)
+class Zone:
     enabled: bool
     ith: int
     name: str
@@ -137,7 +151,9 @@ class DeviceRaw(TypedDict):
     battery_level: NotRequired[float]
 
 class Device(BaseModel):
-    last_active: datetime.datetime
+    model_config = ConfigDict(frozen=True)
+
+    last_active: TzAwareDateTime
     name: str
     serial: str
     status: DeviceStatus
@@ -145,9 +161,7 @@ class Device(BaseModel):
     version: str
     zone_num: int
     zones: list[Zone]
-    batter_level: Optional[float]
-    
-    _make_tz_aware = validator("last_active", pre=True, allow_reuse=True)(make_tz_aware)
+    batter_level: Optional[float] = None
     
     def get_zones (self, only_active: bool = False):
         return [z for z in self.zones if z.enabled or not only_active]
@@ -156,6 +170,8 @@ class InfoDataRaw(TypedDict):
     device: DeviceRaw
 
 class InfoData(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     device: Device
 
 InfoEndpointResponseRaw = SuccessResponseRaw[InfoDataRaw]
@@ -173,32 +189,39 @@ class ScheduleRaw(TypedDict):
     status: ScheduleStatus
     zone: int    
 
-class Schedule(BaseModel):
-    end_time: datetime.datetime
+@dataclass(slots=True, frozen=True)
+class Schedule:
+    end_time: TzAwareDateTime
     id: int
     local_date: datetime.date
     local_end_time: datetime.time
     local_start_time: datetime.time
     source: ScheduleSource
-    start_time: datetime.datetime
+    start_time: TzAwareDateTime
     status: ScheduleStatus
     zone: int
-    duration: Optional[datetime.timedelta]
     
-    _make_tz_aware = validator("start_time", "end_time", pre=True, allow_reuse=True)(make_tz_aware)
-    
-    @validator("duration", always=True)
-    def calc_duration(cls, v, values):
-        return values["end_time"] - values["start_time"]
+    @computed_field
+    @property
+    def duration(self) -> datetime.timedelta:
+        return self.end_time - self.start_time
 
 class ScheduleDataRaw(TypedDict):
     schedules: list[ScheduleRaw]
 
 class ScheduleData(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     schedules: list[Schedule]
+    _by_zone: Optional[dict[int, list[Schedule]]] = PrivateAttr(default=None)
     
     def get_schedules_for_zone (self, zone: int):
-        return [s for s in self.schedules if s.zone == zone]
+        if self._by_zone is None:
+            by_zone: dict[int, list[Schedule]] = {}
+            for s in self.schedules:
+                by_zone.setdefault(s.zone, []).append(s)
+            self._by_zone = by_zone
+        return list(self._by_zone.get(zone, ()))
 
 ScheduleEndpointResponseRaw = SuccessResponseRaw[ScheduleDataRaw]
 
@@ -210,7 +233,8 @@ class MoistureRaw(TypedDict):
     moisture: int
     zone: int
 
-class Moisture(BaseModel):
+@dataclass(slots=True, frozen=True)
+class Moisture:
     date: datetime.date
     id: int
     moisture: int
@@ -220,10 +244,18 @@ class MoistureDataRaw(TypedDict):
     moistures: list[MoistureRaw]
 
 class MoistureData(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     moistures: list[Moisture]
+    _by_zone: Optional[dict[int, list[Moisture]]] = PrivateAttr(default=None)
         
     def get_moistures_for_zone (self, zone: int):
-        return [m for m in self.moistures if m.zone == zone]
+        if self._by_zone is None:
+            by_zone: dict[int, list[Moisture]] = {}
+            for m in self.moistures:
+                by_zone.setdefault(m.zone, []).append(m)
+            self._by_zone = by_zone
+        return list(self._by_zone.get(zone, ()))
 
 MoisturesEndpointResponseRaw = SuccessResponseRaw[MoistureDataRaw]
 
@@ -235,18 +267,19 @@ class EventRaw(TypedDict):
     message: str
     time: str
 
-class Event(BaseModel):
+@dataclass(slots=True, frozen=True)
+class Event:
     event: EventType
     id: int
     message: str
-    time: datetime.datetime
-    
-    _make_tz_aware = validator("time", pre=True, allow_reuse=True)(make_tz_aware)
+    time: TzAwareDateTime
 
 class EventDataRaw(TypedDict):
     events: list[EventRaw]
 
 class EventData(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     events: list[Event]
 
 EventsEndpointResponseRaw = SuccessResponseRaw[EventDataRaw]
@@ -264,9 +297,10 @@ class SensorRaw(TypedDict):
     fahrenheit: float
     battery_level: int
 
-class Sensor(BaseModel):
+@dataclass(slots=True, frozen=True)
+class Sensor:
     id: int
-    time: datetime.datetime
+    time: TzAwareDateTime
     local_date: datetime.date
     local_time: datetime.time
     moisture: int
@@ -274,15 +308,22 @@ class Sensor(BaseModel):
     celsius: float
     fahrenheit: float
     battery_level: int
-    
-    _make_tz_aware = validator("time", pre=True, allow_reuse=True)(make_tz_aware)
 
 class SensorDataRaw(TypedDict):
     sensor_data: list[SensorRaw]
 
 class SensorData(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     sensor_data: list[Sensor]
 
 SensorsEndpointResponseRaw = SuccessResponseRaw[SensorDataRaw]
 
-SensorsEndpointResponse = SuccessResponse[SensorData]
\ No newline at end of file
+SensorsEndpointResponse = SuccessResponse[SensorData]
+
+@dataclass(slots=True, frozen=True)
+class Snapshot:
+    info: InfoEndpointResponse
+    schedules: SchedulesEndpointResponse
+    moistures: MoisturesEndpointResponse
+    events: EventsEndpointResponse
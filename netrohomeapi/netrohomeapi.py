@@ -1,13 +1,26 @@
+import asyncio
 from datetime import date, datetime
+from functools import lru_cache
+from time import monotonic
 from typing import Any, Optional
-from aiohttp import ClientSession
+from aiohttp import (
+    ClientConnectorError,
+    ClientOSError,
+    ClientResponseError,
+    ClientSession,
+    ClientTimeout,
+    ServerDisconnectedError,
+    TCPConnector,
+)
 import logging
+import orjson
+from yarl import URL
+from pydantic import ValidationError
 
 from .models import (
     Device,
     DeviceSetStatus,
     DeviceStatus,
-    ErrorResponse,
     EventType,
     EventsEndpointResponse,
     EventsEndpointResponseRaw,
@@ -15,11 +28,13 @@ from .models import (
     InfoEndpointResponseRaw,
     MoisturesEndpointResponse,
     MoisturesEndpointResponseRaw,
+    ResponseStatus,
     Schedule,
     ScheduleEndpointResponseRaw,
     SchedulesEndpointResponse,
     SensorsEndpointResponse,
     SensorsEndpointResponseRaw,
+    Snapshot,
     SuccessResponse,
     SuccessResponseRaw,
     WeatherConditions
@@ -27,13 +42,87 @@ from .models import (
 
 _LOGGER = logging.getLogger(__name__)
 
+_GET_HEADERS = {
+    "Content-Type": "application/json",
+}
+_POST_HEADERS = {
+    "Accept": "application/json",
+    "Content-Type": "application/json",
+}
+
+def _json_dumps(obj: Any) -> str:
+    return orjson.dumps(obj).decode()
+
+@lru_cache(maxsize=512)
+def _fmt_date(d: Optional[date]) -> Optional[str]:
+    # Unbound date.isoformat also trims a datetime argument down to its date
+    return date.isoformat(d) if d else None
+
+def _fmt_datetime(dt: Optional[datetime]) -> Optional[str]:
+    # Same output as strftime("%Y-%m-%dT%H:%M:%S"): no microseconds, no UTC offset
+    return dt.isoformat(timespec="seconds")[:19] if dt else None
+
+# Query strings need the array spelled out; POST bodies send zones as a JSON array
+def _fmt_zones(zones: Optional[list[int]]) -> Optional[str]:
+    if not zones:
+        return None
+    if len(zones) == 1:
+        return f"[{zones[0]}]"
+    return "[" + ",".join(map(str, zones)) + "]"
+
+def _raise_for_errors(data: dict[str, Any]) -> None:
+    if "errors" in data:
+        error = data["errors"][0]
+        raise NetroException(error["code"], error["message"])
+
+def _decode(body: bytes) -> SuccessResponseRaw:
+    data = orjson.loads(body)
+    _raise_for_errors(data)
+    return data
+
+def _validate(body: bytes, response_model):
+    # Validate straight from the JSON bytes and only decode to a dict for error
+    # envelopes: those either fail validation (no "data") or validate with
+    # status ERROR against models whose data is Any.
+    try:
+        parsed = response_model.model_validate_json(body)
+    except ValidationError as e:
+        error = e
+        parsed = None
+    else:
+        if parsed.status is not ResponseStatus.ERROR:
+            return parsed
+    # Raised outside the except block so NetroException is not chained to the
+    # ValidationError
+    try:
+        data = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        data = None
+    # Anything but a JSON object (e.g. a proxy's HTML page) keeps the validation error
+    if isinstance(data, dict):
+        _raise_for_errors(data)
+    if parsed is None:
+        raise error
+    return parsed
+
+def _is_retryable(error: Exception, method: str) -> bool:
+    # A failed connect never reached the server, so it is safe to repeat even
+    # for POST; anything later may already have started watering.
+    if isinstance(error, ClientConnectorError):
+        return True
+    if method != "GET":
+        return False
+    if isinstance(error, ClientResponseError):
+        return error.status >= 500
+    return True
+
 class NetroException(Exception):
     """standard Netro exception for raising any NPA application error."""
 
-    def __init__(self, result: ErrorResponse) -> None:
+    def __init__(self, code: int, message: str) -> None:
         """Make an exception from any result error code and message."""
-        self.message = result.errors[0].message #["errors"][0]["message"]
-        self.code = result.errors[0].code
+        self.message = message
+        self.code = code
 
     def __str__(self):
         """Return a literal error message related to the current exception."""
@@ -43,233 +132,302 @@ class NetroException(Exception):
 
 class NetroHomeAPI:
     BASE_URL = 'http://api.netrohome.com/npa/v1'
+    ENDPOINTS = (
+        'info',
+        'set_status',
+        'schedules',
+        'water',
+        'moistures',
+        'set_moisture',
+        'events',
+        'stop_water',
+        'no_water',
+        'report_weather',
+        'sensor_data',
+    )
 
-    def __init__(self, api_key, session: Optional[ClientSession] = None):
+    DEFAULT_CACHE_TTLS = {
+        'info': 60,
+        'schedules': 30,
+        'moistures': 30,
+        'events': 15,
+    }
+
+    def __init__(self,
+        api_key,
+        session: Optional[ClientSession] = None,
+        cache_ttl: float = 0,
+        cache_ttls: Optional[dict[str, float]] = None,
+        timeout: float = 10,
+        max_retries: int = 3,
+        retry_backoff: float = 0.3,
+    ):
+        self._timeout = ClientTimeout(total=timeout)
+        self._max_retries = max_retries
+        self._retry_backoff = retry_backoff
+        self._cache_ttl = cache_ttl
+        self._cache_ttls = cache_ttls or {}
+        self._cache: dict[tuple[str, frozenset], tuple[float, Any]] = {}
+        # Bumped on every invalidation so reads in flight at the time are not stored
+        self._cache_generation = 0
+        self._session = session
+        self._owns_session = False
+        self._urls = {endpoint: URL(f"{self.BASE_URL}/{endpoint}.json") for endpoint in self.ENDPOINTS}
         self.api_key = api_key
-        self.session = ClientSession() if not session else session
-        
-    def _get_url(self, endpoint):
-        return f"{self.BASE_URL}/{endpoint}.json"
+
+    @property
+    def api_key(self) -> str:
+        return self._api_key
+
+    @api_key.setter
+    def api_key(self, api_key: str):
+        # Everything that carries the key is rebuilt, so a new key is used from the
+        # next request; cached responses may belong to another controller
+        self._api_key = api_key
+        self.clear_cache()
+        self._base_params: dict[str, Any] = {"key": api_key}
+        # GETs that only carry the key reuse a fully encoded URL
+        self._key_urls = {endpoint: url.with_query(self._base_params) for endpoint, url in self._urls.items()}
+
+    @property
+    def session(self) -> Optional[ClientSession]:
+        return self._session
+
+    @session.setter
+    def session(self, session: Optional[ClientSession]):
+        # An assigned session belongs to the caller and is never closed here
+        self._session = session
+        self._owns_session = False
+
+    async def _ensure_session(self) -> ClientSession:
+        # Only called from a coroutine, so the session binds to the running loop
+        if self._session is None:
+            self._session = ClientSession(
+                connector=TCPConnector(
+                    limit=100,
+                    limit_per_host=20,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=75,
+                ),
+                json_serialize=_json_dumps,
+            )
+            self._owns_session = True
+        return self._session
+
+    async def close(self):
+        """Close the session if it was created by this client."""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+            self._owns_session = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    @staticmethod
+    def install_uvloop():
+        """Run asyncio on uvloop; call before the event loop is created."""
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
     
-    async def _get_async(self, endpoint, params={}) -> SuccessResponseRaw:
-        if(self.session is None):
-            raise Exception("No session provided")
-        
-        url = self._get_url(endpoint)
-        headers = {
-            "Content-Type": "application/json",
-        }
-        base_params = {
-          "key": self.api_key
-        }
-        async with self.session.get(url, headers=headers, params={**base_params, **params}) as response:
-            response.raise_for_status()
-            data = await response.json()
-            if "errors" in data:
-                raise NetroException(ErrorResponse.parse_obj(data))
-            return data
-    
-    async def _post_async(self, endpoint, data={}) -> SuccessResponseRaw:
-        if self.session is None:
-            raise Exception("No session provided")
-        
-        url = self._get_url(endpoint)
-        headers = {
-            "Accept": "application/json",
-            "Content-Type": "application/json",
-        }
-        base_data = {
-          "key": self.api_key
-        }
-        async with self.session.post(url, headers=headers, json={**base_data, **data}) as response:
-            response.raise_for_status()
-            data = await response.json()
-            if "errors" in data:
-                raise NetroException(ErrorResponse.parse_obj(data))
-            return data
+    def clear_cache(self):
+        """Drop all cached responses; reads already in flight are not cached."""
+        self._cache_generation += 1
+        self._cache.clear()
+
+    def _build_params(self, **kw) -> dict[str, Any]:
+        # The shared base dict is handed out as-is when every filter is None, so
+        # unfiltered GETs reuse the prebuilt URL; callers must treat it as read-only
+        extra = {k: v for k, v in kw.items() if v is not None}
+        if not extra:
+            return self._base_params
+        return {**self._base_params, **extra}
+
+    async def _request_bytes(self, endpoint, method, params) -> bytes:
+        session = await self._ensure_session()
+        if method == "GET":
+            if params is self._base_params:
+                url = self._key_urls[endpoint]
+            else:
+                url = self._urls[endpoint].with_query(params)
+            async with session.get(url, headers=_GET_HEADERS, timeout=self._timeout) as response:
+                response.raise_for_status()
+                return await response.read()
+
+        # Anything posted may change device state, so cached reads are stale.
+        # Clear again once it is done: a read started meanwhile may predate it.
+        self.clear_cache()
+        try:
+            async with session.post(self._urls[endpoint], headers=_POST_HEADERS, json=params, timeout=self._timeout) as response:
+                response.raise_for_status()
+                return await response.read()
+        finally:
+            self.clear_cache()
+
+    async def _request_with_retry(self, endpoint, method, params) -> bytes:
+        attempt = 0
+        while True:
+            try:
+                return await self._request_bytes(endpoint, method, params)
+            except (ClientOSError, ServerDisconnectedError, ClientResponseError) as e:
+                if attempt >= self._max_retries or not _is_retryable(e, method):
+                    raise
+                _LOGGER.debug("Retrying %s %s after %r", method, endpoint, e)
+                await asyncio.sleep(self._retry_backoff * 2 ** attempt)
+                attempt += 1
+
+    async def _request(self, endpoint, method="GET", response_model=None, **kw):
+        params = self._build_params(**kw)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("%s %s", method, endpoint)
+        try:
+            body = await self._request_with_retry(endpoint, method, params)
+            if response_model is None:
+                return _decode(body)
+            return _validate(body, response_model)
+        except Exception:
+            _LOGGER.error("Failed to %s %s", method, endpoint)
+            raise
+
+    async def _fetch(self, endpoint, response_model, method="GET", **kw):
+        ttl = self._cache_ttls.get(endpoint, self._cache_ttl)
+        if method != "GET" or ttl <= 0:
+            return await self._request(endpoint, method, response_model, **kw)
+
+        key = (endpoint, frozenset(kw.items()))
+        now = monotonic()
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+        generation = self._cache_generation
+        parsed = await self._request(endpoint, method, response_model, **kw)
+        if generation != self._cache_generation:
+            return parsed
+        now = monotonic()
+        self._cache = {k: v for k, v in self._cache.items() if v[0] > now}
+        self._cache[key] = (now + ttl, parsed)
+        return parsed
 
     
     
+    # Snapshot
+    async def snapshot(self, start_date:Optional[date]=None, end_date:Optional[date]=None, zones:Optional[list[int]]=None) -> Snapshot:
+        """Fetch info, schedules, moistures and events concurrently."""
+        info, schedules, moistures, events = await asyncio.gather(
+            self.get_info(),
+            self.get_schedules(start_date=start_date, end_date=end_date, zones=zones),
+            self.get_moistures(start_date=start_date, end_date=end_date, zones=zones),
+            self.get_events(start_date=start_date, end_date=end_date),
+        )
+        return Snapshot(info=info, schedules=schedules, moistures=moistures, events=events)
+
+
+
     # Device
     async def get_info_raw(self) -> InfoEndpointResponseRaw:
-        try:
-            _LOGGER.debug("Fetching info")
-            return await self._get_async('info')
-        except Exception as e:
-            _LOGGER.error("Failed to fetch info")
-            raise e
+        return await self._request('info')
         
     async def get_info(self) -> InfoEndpointResponse:
-        res = await self.get_info_raw()
-        return InfoEndpointResponse.parse_obj(res)
+        return await self._fetch('info', InfoEndpointResponse)
 
     async def set_device_status_raw(self, status:int) -> SuccessResponseRaw:
-        try:
-            _LOGGER.debug("Setting status")
-            return await self._post_async('set_status', data={
-                "status": status
-            })
-        except Exception as e:
-            _LOGGER.error("Failed to set status")
-            raise e
+        return await self._request('set_status', "POST", status=status)
         
     async def set_device_status(self, status:DeviceSetStatus):
-        data = await self.set_device_status_raw(status)
-        return SuccessResponse.parse_obj(data)
+        return await self._fetch('set_status', SuccessResponse, "POST", status=status)
         
     
     
     # Schedules
     async def get_schedules_raw(self, start_date:Optional[str]=None, end_date:Optional[str]=None, zones:Optional[list[int]]=None) -> ScheduleEndpointResponseRaw:
-        params = {}
-        if zones:
-            params.update({"zones": str(zones)})
-        if start_date:
-            params.update({"start_date": start_date})
-        if end_date:
-            params.update({"end_date": end_date})
-        try:
-            _LOGGER.debug("Fetching schedules")
-            return await self._get_async('schedules', params)
-        except Exception as e:
-            _LOGGER.error("Failed to fetch schedules")
-            raise e
+        return await self._request('schedules',
+            zones=_fmt_zones(zones),
+            start_date=start_date,
+            end_date=end_date,
+        )
     
     async def get_schedules(self, start_date:Optional[date]=None, end_date:Optional[date]=None, zones:Optional[list[int]]=None) -> SchedulesEndpointResponse:
-        res = await self.get_schedules_raw(
-            start_date=start_date.strftime("%Y-%m-%d") if start_date else None,
-            end_date=end_date.strftime("%Y-%m-%d") if end_date else None, 
-            zones=zones
+        return await self._fetch('schedules', SchedulesEndpointResponse,
+            zones=_fmt_zones(zones),
+            start_date=_fmt_date(start_date),
+            end_date=_fmt_date(end_date),
         )
-        return SchedulesEndpointResponse.parse_obj(res)
     
     async def set_schedule_raw(self, zones:Optional[list[int]]=None, duration:int=1, delay:Optional[int]=None, start_time:Optional[str]=None) -> ScheduleEndpointResponseRaw:
-        params: dict[str,Any] = {
-            "duration": duration
-        }
-        if zones:
-            params.update({"zones": str(zones)})
-        if delay:
-            params.update({"delay": delay})
-        if start_time:
-            params.update({"start_time": start_time})
-        try:
-            _LOGGER.debug("Setting schedule")
-            return await self._post_async('water', params)
-        except Exception as e:
-            _LOGGER.error("Failed to set schedule")
-            raise e
+        return await self.water_raw(duration=duration, zones=zones, delay=delay, start_time=start_time)
         
     async def set_schedule(self, zones:Optional[list[int]]=None, duration:int=1, delay:Optional[int]=None, start_time:Optional[datetime]=None) -> SchedulesEndpointResponse:
-        res = await self.set_schedule_raw(
-            zones=zones, 
-            duration=duration, 
-            delay=delay if delay else None, 
-            start_time=start_time.strftime("%Y-%m-%dT%H:%M:%S") if start_time else None
-        )
-        return SchedulesEndpointResponse.parse_obj(res)
+        return await self.water(duration=duration, zones=zones, delay=delay, start_time=start_time)
     
 
     
     # Moistures
     async def get_moistures_raw(self, start_date:Optional[str]=None, end_date:Optional[str]=None, zones:Optional[list[int]]=None) -> MoisturesEndpointResponseRaw:
-        params = {}
-        if zones:
-            params.update({"zones": str(zones)})
-        if start_date:
-            params.update({"start_date": start_date})
-        if end_date:
-            params.update({"end_date": end_date})
-        try:
-            _LOGGER.debug("Fetching moistures")
-            return await self._get_async('moistures', params)
-        except Exception as e:
-            _LOGGER.error("Failed to fetch moistures")
-            raise e
+        return await self._request('moistures',
+            zones=_fmt_zones(zones),
+            start_date=start_date,
+            end_date=end_date,
+        )
         
     async def get_moistures(self, start_date:Optional[date]=None, end_date:Optional[date]=None, zones:Optional[list[int]]=None) -> MoisturesEndpointResponse:
-        res = await self.get_moistures_raw(
-            start_date=start_date.strftime("%Y-%m-%d") if start_date else None,
-            end_date=end_date.strftime("%Y-%m-%d") if end_date else None,
-            zones=zones
+        return await self._fetch('moistures', MoisturesEndpointResponse,
+            zones=_fmt_zones(zones),
+            start_date=_fmt_date(start_date),
+            end_date=_fmt_date(end_date),
         )
-        return MoisturesEndpointResponse.parse_obj(res)
     
-    async def set_moisture_raw(self, moisture:int, zones:Optional[list[int]]=None) -> MoisturesEndpointResponseRaw:
-        params: dict[str,Any] = {
-            "moisture": moisture
-        }
-        if zones:
-            params.update({"zones": str(zones)})
-        try:
-            _LOGGER.debug("Setting moisture")
-            return await self._post_async('water', params)
-        except Exception as e:
-            _LOGGER.error("Failed to set moisture")
-            raise e
+    async def set_moisture_raw(self, moisture:int, zones:Optional[list[int]]=None) -> SuccessResponseRaw:
+        return await self._request('set_moisture', "POST",
+            moisture=moisture,
+            zones=zones or None,
+        )
         
-    async def set_moisture(self, moisture:int, zones:Optional[list[int]]=None) -> MoisturesEndpointResponse:
-        res = await self.set_moisture_raw(
+    async def set_moisture(self, moisture:int, zones:Optional[list[int]]=None) -> SuccessResponse:
+        return await self._fetch('set_moisture', SuccessResponse, "POST",
             moisture=moisture,
-            zones=zones, 
+            zones=zones or None,
         )
-        return MoisturesEndpointResponse.parse_obj(res)
     
     
     
     # Events
     async def get_events_raw(self, start_date:Optional[str]=None, end_date:Optional[str]=None, event:Optional[int]=None) -> EventsEndpointResponseRaw:
-        params = {}
-        if event:
-            params.update({"event": event})
-        if start_date:
-            params.update({"start_date": start_date})
-        if end_date:
-            params.update({"end_date": end_date})
-        try:
-            _LOGGER.debug("Fetching events")
-            return await self._get_async('events', params)
-        except Exception as e:
-            _LOGGER.error("Failed to fetch events")
-            raise e
+        return await self._request('events',
+            event=event,
+            start_date=start_date,
+            end_date=end_date,
+        )
     
     async def get_events(self, start_date:Optional[date]=None, end_date:Optional[date]=None, event:Optional[EventType]=None) -> EventsEndpointResponse:
-        res = await self.get_events_raw(
-                start_date=start_date.strftime("%Y-%m-%d") if start_date else None,
-                end_date=end_date.strftime("%Y-%m-%d") if end_date else None,
-                event=event.value if event else None
-            )
-        return EventsEndpointResponse.parse_obj(res)
+        return await self._fetch('events', EventsEndpointResponse,
+            event=event,
+            start_date=_fmt_date(start_date),
+            end_date=_fmt_date(end_date),
+        )
     
     
     
     # Water
     async def water_raw(self, duration:int, zones:Optional[list[int]]=None, delay:Optional[int]=None, start_time:Optional[str]=None) -> ScheduleEndpointResponseRaw:
-        params: dict[str,Any] = {
-            "duration": duration
-        }
-        if zones:
-            params.update({"zones": str(zones)})
-        if delay:
-            params.update({"delay": delay})
-        if start_time:
-            params.update({"start_time": start_time})
-        try:
-            _LOGGER.debug("Watering")
-            return await self._post_async('water', params)
-        except Exception as e:
-            _LOGGER.error("Failed to water")
-            raise e
+        return await self._request('water', "POST",
+            duration=duration,
+            zones=zones or None,
+            delay=delay,
+            start_time=start_time,
+        )
 
     async def water(self, duration:int, zones:Optional[list[int]]=None, delay:Optional[int]=None, start_time:Optional[datetime]=None) -> SchedulesEndpointResponse:
-        res = await self.water_raw(
-            zones=zones, 
-            duration=duration, 
-            delay=delay if delay else None, 
-            start_time=start_time.strftime("%Y-%m-%dT%H:%M:%S") if start_time else None
+        return await self._fetch('water', SchedulesEndpointResponse, "POST",
+            duration=duration,
+            zones=zones or None,
+            delay=delay,
+            start_time=_fmt_datetime(start_time),
         )
-        return SchedulesEndpointResponse.parse_obj(res)
     
     async def water_as_schedule_raw(self, zones:Optional[list[int]]=None, duration:int=1):
         return await self.set_schedule_raw(zones=zones, duration=duration)
@@ -279,31 +437,17 @@ class NetroHomeAPI:
     
         
     async def stop_water_raw(self):
-        try:
-            _LOGGER.debug("Stopping water")
-            return await self._post_async('stop_water')
-        except Exception as e:
-            _LOGGER.error("Failed to stop water")
-            raise e
+        return await self._request('stop_water', "POST")
         
     async def stop_water(self):
-        data = await self.stop_water_raw()
-        return SuccessResponse.parse_obj(data)
+        return await self._fetch('stop_water', SuccessResponse, "POST")
   
     
     async def no_water_raw(self, days:Optional[int]=None):
-        try:
-            _LOGGER.debug("Setting no water")
-            return await self._post_async('no_water', data={
-                "days": days
-            })
-        except Exception as e:
-            _LOGGER.error("Failed to set no water")
-            raise e
+        return await self._request('no_water', "POST", days=days)
     
     async def no_water(self, days:Optional[int]=None):
-        data = await self.no_water_raw(days=days)
-        return SuccessResponse.parse_obj(data)
+        return await self._fetch('no_water', SuccessResponse, "POST", days=days)
     
     # Weather
     async def report_weather_raw(self, 
@@ -319,37 +463,19 @@ class NetroHomeAPI:
         humidity: Optional[float],
         pressure: Optional[float],
     ):
-        params: dict[str, Any] = {
-            "date": date
-        }
-
-        if condition:
-            params.update({"condition": condition})
-        if rain:
-            params.update({"rain": rain})
-        if rain_prob:
-            params.update({"rain_prob": rain_prob})
-        if temp:
-            params.update({"temp": temp})
-        if t_min:
-            params.update({"t_min": t_min})
-        if t_max:
-            params.update({"t_max": t_max})
-        if t_dew:
-            params.update({"t_dew": t_dew})
-        if wind_speed:
-            params.update({"wind_speed": wind_speed})
-        if humidity:
-            params.update({"humidity": humidity})
-        if pressure:
-            params.update({"pressure": pressure})
-            
-        try:
-            _LOGGER.debug("Reporting weather")
-            return await self._post_async('report_weather', params)
-        except Exception as e:
-            _LOGGER.error("Failed to report weather")
-            raise e
+        return await self._request('report_weather', "POST",
+            date=date,
+            condition=condition,
+            rain=rain,
+            rain_prob=rain_prob,
+            temp=temp,
+            t_min=t_min,
+            t_max=t_max,
+            t_dew=t_dew,
+            wind_speed=wind_speed,
+            humidity=humidity,
+            pressure=pressure,
+        )
 
     async def report_weather(self, 
         date: date, 
@@ -364,8 +490,8 @@ class NetroHomeAPI:
         humidity: Optional[float],
         pressure: Optional[float],
     ):
-        data = await self.report_weather_raw(
-            date=date.strftime("%Y-%m-%d"),
+        return await self._fetch('report_weather', SuccessResponse, "POST",
+            date=_fmt_date(date),
             condition=condition,
             rain=rain,
             rain_prob=rain_prob,
@@ -377,30 +503,16 @@ class NetroHomeAPI:
             humidity=humidity,
             pressure=pressure,
         )
-        return SuccessResponse.parse_obj(data)
 
     # Sensors
     async def get_sensor_data_raw(self, from_date: Optional[str], to_date: Optional[str]) -> SensorsEndpointResponseRaw:
-        params: dict[str, Any] = {}
-        if from_date:
-            params.update({"from_date": from_date})
-        if to_date:
-            params.update({"to_date": to_date})
-        try:
-            _LOGGER.debug("Fetching sensor data")
-            return await self._get_async('sensor_data', params)
-        except Exception as e:
-            _LOGGER.error("Failed to fetch sensor data")
-            raise e
+        return await self._request('sensor_data',
+            from_date=from_date,
+            to_date=to_date,
+        )
 
     async def get_sensor_data(self, from_date: Optional[date], to_date: Optional[date]) -> SensorsEndpointResponse:
-        res = await self.get_sensor_data_raw(
-            from_date=from_date.strftime("%Y-%m-%d") if from_date else None,
-            to_date=to_date.strftime("%Y-%m-%d") if to_date else None,
+        return await self._fetch('sensor_data', SensorsEndpointResponse,
+            from_date=_fmt_date(from_date),
+            to_date=_fmt_date(to_date),
         )
-        return SensorsEndpointResponse.parse_obj(res)
-        
-
-
-
-    
@@ -14,8 +14,13 @@ setup(
     download_url='https://github.com/GeorgeBark/netrohomeapi/archive/refs/tags/v0.1.2.tar.gz',
     install_requires=[
         'aiohttp',
-        'pydantic'
+        'orjson',
+        'yarl',
+        'pydantic>=2'
     ],
+    extras_require={
+        'uvloop': ['uvloop; platform_system != "Windows"'],
+    },
     classifiers=[
         'Development Status :: 4 - Beta',
         'Intended Audience :: Developers',